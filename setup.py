@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Build script for the optional compiled converter
+
+final_converter.py is compiled as-is with Cython when Cython is importable at
+build time, which removes much of the interpreter overhead of the recursive
+conversion. Cython is deliberately not a build requirement, so a plain
+`pip install .` installs the pure-Python module. To get the compiled build,
+install Cython and build without isolation:
+
+    pip install cython
+    pip install --no-build-isolation .
+
+A failed compile (e.g. no C compiler) also falls back to the pure-Python module.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        "src/final_converter.py",
+        language_level=3,
+        compiler_directives={
+            # Annotations are documentation only; don't turn them into type checks
+            "annotation_typing": False,
+        },
+    )
+    for ext in ext_modules:
+        ext.optional = True
+
+setup(ext_modules=ext_modules)
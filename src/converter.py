@@ -8,133 +8,255 @@ Date: August 10, 2025
 """
 
 import json
+import os
 import yaml
 import sys
 import re
-from datetime import datetime
-from typing import Any, Dict, List, Union
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
 from pathlib import Path
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# orjson is faster but does not accept everything json does (see README),
+# so it is only used when SAIL_TO_CGEN_ORJSON=1 is set
+_json_loads = json.loads
+if os.environ.get('SAIL_TO_CGEN_ORJSON') == '1':
+    try:
+        import orjson
+        _json_loads = orjson.loads
+    except ImportError:
+        pass
+
+
+# Keys whose string values are always treated as dates
+_DATE_KEYWORDS = frozenset(['date', 'timestamp', 'created', 'updated', 'time'])
+
+# Buffered tokens are written out once this many have accumulated
+_STREAM_CHUNK = 8192
+
+# Lists longer than this are checked for the homogeneous scalar fast path
+_FAST_LIST_MIN = 32
+
+
+def _escape(data: str) -> str:
+    """Escape backslashes and double quotes for a Scheme string literal"""
+    if '"' not in data and '\\' not in data:
+        return data
+    return data.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _format_string(data: str) -> str:
+    """Format a string as a part-number symbol or an escaped string literal"""
+    # Check if it's a part number or ID (one capital letter then digits);
+    # data[1] is tested first so ordinary words are rejected without a slice
+    if (len(data) >= 2 and 'A' <= data[0] <= 'Z'
+            and data[1].isdecimal() and data[1:].isdecimal()):
+        return f"'{data}"
+    
+    # Escape quotes and special characters
+    return f'"{_escape(data)}"'
+
+
+# Formatters for list elements of a single scalar type, used to skip
+# per-element dispatch on long homogeneous lists
+_SCALAR_FORMATTERS = {
+    int: str,
+    float: str,
+    bool: lambda value: "#t" if value else "#f",
+    type(None): lambda value: "nil",
+    str: _format_string,
+}
+
+
+# Common date formats, tried in order. Each pattern accepts exactly what
+# datetime.strptime accepts for the directive, and is paired with the
+# positions of its (year, month, day) groups.
+_YEAR = r'(\d\d\d\d)'
+_MONTH = r'(1[0-2]|0[1-9]|[1-9])'
+_DAY = r'(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])'
+_DATE_FORMATS = (
+    (re.compile(f'{_YEAR}-{_MONTH}-{_DAY}'), (1, 2, 3)),  # %Y-%m-%d
+    (re.compile(f'{_YEAR}/{_MONTH}/{_DAY}'), (1, 2, 3)),  # %Y/%m/%d
+    (re.compile(f'{_DAY}/{_MONTH}/{_YEAR}'), (3, 2, 1)),  # %d/%m/%Y
+    (re.compile(f'{_MONTH}/{_DAY}/{_YEAR}'), (3, 1, 2)),  # %m/%d/%Y
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> Optional[Tuple[int, int, int]]:
+    """Parse a date string into (year, month, day), or None if unrecognised"""
+    for pattern, (year, month, day) in _DATE_FORMATS:
+        match = pattern.fullmatch(date_str)
+        if not match:
+            continue
+        parsed_date = int(match[year]), int(match[month]), int(match[day])
+        try:
+            date(*parsed_date)
+        except ValueError:
+            # Right shape but not a real calendar date
+            continue
+        return parsed_date
+    return None
+
 
 class SExpressionConverter:
     """Converts structured data to S-expression format"""
     
     def __init__(self, namespace_prefix: str = "yaml"):
         self.namespace_prefix = namespace_prefix
+        self._ns_open = f"({namespace_prefix}:"
         self.indent_level = 0
         self.indent_size = 2
+        self._stream = None
+        # Keyed on exact type so bool is not handled as int
+        self._dispatch = {
+            dict: self._convert_dict,
+            list: self._convert_list,
+            str: self._convert_string,
+            int: self._convert_number,
+            float: self._convert_number,
+            bool: self._convert_boolean,
+            type(None): self._convert_null,
+        }
     
     def convert(self, data: Any, key: str = None) -> str:
         """Main conversion method"""
-        if isinstance(data, dict):
-            return self._convert_dict(data, key)
-        elif isinstance(data, list):
-            return self._convert_list(data, key)
-        elif isinstance(data, str):
-            return self._convert_string(data, key)
-        elif isinstance(data, (int, float)):
-            return self._convert_number(data, key)
-        elif isinstance(data, bool):
-            return self._convert_boolean(data, key)
-        elif data is None:
-            return self._convert_null(data, key)
-        else:
-            return self._convert_unknown(data, key)
+        out = []
+        self._emit(data, key, out)
+        return ''.join(out)
     
-    def _convert_dict(self, data: Dict, key: str = None) -> str:
+    def convert_to(self, data: Any, stream: TextIO, key: str = None) -> None:
+        """Write the conversion to stream without building the whole string"""
+        out = []
+        self._stream = stream
+        try:
+            self._emit(data, key, out)
+        finally:
+            self._stream = None
+        stream.write(''.join(out))
+    
+    def _flush(self, out: List[str]) -> None:
+        """Write buffered tokens to the output stream"""
+        self._stream.write(''.join(out))
+        out.clear()
+    
+    def _emit(self, data: Any, key: str, out: List[str]) -> None:
+        """Append the S-expression tokens for data to out"""
+        handler = self._dispatch.get(type(data), self._convert_unknown)
+        handler(data, key, out)
+    
+    def _convert_dict(self, data: Dict, key: str, out: List[str]) -> None:
         """Convert dictionary to S-expression"""
-        items = []
+        out.append(f"{self._ns_open}{key} " if key else "(")
+        
+        # Bind hot lookups to locals for the loop
+        append = out.append
+        emit = self._emit
+        is_date_field = self._is_date_field
+        ns_open = self._ns_open
         
-        for k, v in data.items():
+        for i, (k, v) in enumerate(data.items()):
+            if len(out) >= _STREAM_CHUNK and self._stream is not None:
+                self._flush(out)
+            if i:
+                append(' ')
             # Special handling for common patterns
-            if self._is_date_field(k, v):
-                items.append(self._convert_date(v, k))
-            elif k in ['items'] and isinstance(v, list):
-                items.append(self._convert_items_list(v, k))
+            if is_date_field(k, v):
+                self._convert_date(v, k, out)
+            elif k == 'items' and type(v) is list:
+                self._convert_items_list(v, k, out)
             else:
-                converted_value = self.convert(v)
-                items.append(f"({self.namespace_prefix}:{k} {converted_value})")
+                append(f"{ns_open}{k} ")
+                emit(v, None, out)
+                append(')')
         
-        if key:
-            return f"({self.namespace_prefix}:{key} {' '.join(items)})"
-        else:
-            return f"({' '.join(items)})"
+        out.append(')')
     
-    def _convert_list(self, data: List, key: str = None) -> str:
+    def _convert_list(self, data: List, key: str, out: List[str]) -> None:
         """Convert list to S-expression"""
-        items = []
-        for item in data:
+        out.append(f"{self._ns_open}{key} " if key else "(")
+        
+        # Fast path: a long list of one scalar type is formatted in slices of
+        # _STREAM_CHUNK elements, flushing between slices when streaming
+        if len(data) > _FAST_LIST_MIN:
+            item_type = type(data[0])
+            formatter = _SCALAR_FORMATTERS.get(item_type)
+            if formatter is not None and all(type(item) is item_type for item in data):
+                for start in range(0, len(data), _STREAM_CHUNK):
+                    if start:
+                        out.append(' ')
+                    out.append(' '.join(map(formatter, data[start:start + _STREAM_CHUNK])))
+                    if self._stream is not None:
+                        self._flush(out)
+                out.append(')')
+                return
+        
+        for i, item in enumerate(data):
+            if len(out) >= _STREAM_CHUNK and self._stream is not None:
+                self._flush(out)
+            if i:
+                out.append(' ')
             if isinstance(item, dict) and key == 'items':
                 # Special handling for items list
-                items.append(self.convert(item, 'item'))
+                self._emit(item, 'item', out)
             else:
-                items.append(self.convert(item))
+                self._emit(item, None, out)
         
-        list_content = ' '.join(items)
-        if key:
-            return f"({self.namespace_prefix}:{key} {list_content})"
-        else:
-            return f"({list_content})"
+        out.append(')')
     
-    def _convert_items_list(self, data: List, key: str) -> str:
+    def _convert_items_list(self, data: List, key: str, out: List[str]) -> None:
         """Special handling for items list"""
-        items = []
-        for item in data:
-            items.append(self.convert(item, 'item'))
-        return f"({self.namespace_prefix}:{key} {' '.join(items)})"
+        out.append(f"{self._ns_open}{key} ")
+        
+        for i, item in enumerate(data):
+            if len(out) >= _STREAM_CHUNK and self._stream is not None:
+                self._flush(out)
+            if i:
+                out.append(' ')
+            self._emit(item, 'item', out)
+        
+        out.append(')')
     
-    def _convert_string(self, data: str, key: str = None) -> str:
+    def _convert_string(self, data: str, key: str, out: List[str]) -> None:
         """Convert string with proper escaping"""
-        # Check if it's a part number or ID (starts with letter+numbers)
-        if re.match(r'^[A-Z]\d+$', data):
-            return f"'{data}"
-        
-        # Escape quotes and special characters
-        escaped = data.replace('\\', '\\\\').replace('"', '\\"')
-        return f'"{escaped}"'
+        out.append(_format_string(data))
     
-    def _convert_number(self, data: Union[int, float], key: str = None) -> str:
+    def _convert_number(self, data: Union[int, float], key: str, out: List[str]) -> None:
         """Convert number"""
-        return str(data)
+        out.append(str(data))
     
-    def _convert_boolean(self, data: bool, key: str = None) -> str:
+    def _convert_boolean(self, data: bool, key: str, out: List[str]) -> None:
         """Convert boolean to Scheme format"""
-        return "#t" if data else "#f"
+        out.append("#t" if data else "#f")
     
-    def _convert_null(self, data: None, key: str = None) -> str:
+    def _convert_null(self, data: None, key: str, out: List[str]) -> None:
         """Convert null to nil"""
-        return "nil"
+        out.append("nil")
     
-    def _convert_unknown(self, data: Any, key: str = None) -> str:
+    def _convert_unknown(self, data: Any, key: str, out: List[str]) -> None:
         """Convert unknown types"""
-        return f'"{str(data)}"'
+        out.append(f'"{str(data)}"')
     
     def _is_date_field(self, key: str, value: Any) -> bool:
         """Check if field represents a date"""
-        date_keywords = ['date', 'timestamp', 'created', 'updated', 'time']
-        return key.lower() in date_keywords and isinstance(value, str)
+        return key.lower() in _DATE_KEYWORDS and isinstance(value, str)
     
-    def _convert_date(self, date_str: str, key: str) -> str:
+    def _convert_date(self, date_str: str, key: str, out: List[str]) -> None:
         """Convert date string to make-date call"""
-        try:
-            # Try to parse common date formats
-            formats = ['%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%m/%d/%Y']
-            parsed_date = None
-            
-            for fmt in formats:
-                try:
-                    parsed_date = datetime.strptime(date_str, fmt)
-                    break
-                except ValueError:
-                    continue
-            
-            if parsed_date:
-                return f"({self.namespace_prefix}:{key} (make-date {parsed_date.year} {parsed_date.month:02d} {parsed_date.day:02d}))"
-            else:
-                # If parsing fails, treat as string
-                return f"({self.namespace_prefix}:{key} \"{date_str}\")"
-        except:
-            return f"({self.namespace_prefix}:{key} \"{date_str}\")"
+        parsed_date = _parse_date(date_str)
+        
+        if parsed_date:
+            year, month, day = parsed_date
+            out.append(f"{self._ns_open}{key} (make-date {year} {month:02d} {day:02d}))")
+        else:
+            # If parsing fails, treat as string
+            out.append(f"{self._ns_open}{key} \"{date_str}\")")
 
 
 def load_data(file_path: str) -> Any:
@@ -144,21 +266,21 @@ def load_data(file_path: str) -> Any:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    with open(path, 'r', encoding='utf-8') as file:
+    # Read raw bytes: both parsers detect the encoding themselves
+    with open(path, 'rb') as file:
         if path.suffix.lower() in ['.yaml', '.yml']:
-            return yaml.safe_load(file), 'yaml'
+            return yaml.load(file, Loader=_YamlLoader), 'yaml'
         elif path.suffix.lower() == '.json':
-            return json.load(file), 'json'
+            return _json_loads(file.read()), 'json'
         else:
             # Try to detect format
             content = file.read()
-            file.seek(0)
             
             try:
-                return yaml.safe_load(file), 'yaml'
+                return yaml.load(content, Loader=_YamlLoader), 'yaml'
             except:
                 try:
-                    return json.loads(content), 'json'
+                    return _json_loads(content), 'json'
                 except:
                     raise ValueError("Unable to parse file as YAML or JSON")
 
@@ -176,12 +298,10 @@ def main():
         # Load data
         data, format_type = load_data(input_file)
         
-        # Convert to S-expression
+        # Convert and stream the S-expression
         converter = SExpressionConverter(namespace_prefix=format_type)
-        s_expression = converter.convert(data)
-        
-        # Output result
-        print(s_expression)
+        converter.convert_to(data, sys.stdout)
+        sys.stdout.write('\n')
         
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -8,26 +8,121 @@ Date: August 10, 2025
 """
 
 import json
+import os
 import yaml
 import sys
 import re
-from datetime import datetime
-from typing import Any, Dict, List, Union
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
 from pathlib import Path
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# orjson is faster but does not accept everything json does (see README),
+# so it is only used when SAIL_TO_CGEN_ORJSON=1 is set
+_json_loads = json.loads
+if os.environ.get('SAIL_TO_CGEN_ORJSON') == '1':
+    try:
+        import orjson
+        _json_loads = orjson.loads
+    except ImportError:
+        pass
+
+
+# Precompiled pattern for spotting date-like values
+_DATE_PATTERNS_RE = re.compile(
+    r'^(?:\d{4}-\d{2}-\d{2}'  # YYYY-MM-DD
+    r'|\d{2}/\d{2}/\d{4}'     # DD/MM/YYYY or MM/DD/YYYY
+    r'|\d{4}/\d{2}/\d{2})'    # YYYY/MM/DD
+)
+
+# Keys whose string values are always treated as dates
+_DATE_KEYWORDS = frozenset(['date', 'timestamp', 'created', 'updated', 'time', 'when'])
+
+# Buffered tokens are written out once this many have accumulated
+_STREAM_CHUNK = 8192
+
+# Lists longer than this are checked for the homogeneous scalar fast path
+_FAST_LIST_MIN = 32
+
+
+def _escape(data: str) -> str:
+    """Escape backslashes and double quotes for a Scheme string literal"""
+    if '"' not in data and '\\' not in data:
+        return data
+    return data.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _format_string(data: str) -> str:
+    """Format a string as a part-number symbol or an escaped string literal"""
+    # Part numbers and IDs (one capital letter then digits); data[1] is
+    # tested first so ordinary words are rejected without a slice
+    if (len(data) >= 2 and 'A' <= data[0] <= 'Z'
+            and data[1].isdecimal() and data[1:].isdecimal()):
+        return f"'{data}"
+    
+    # Proper string escaping
+    return f'"{_escape(data)}"'
+
+
+# Formatters for list elements of a single scalar type, used to skip
+# per-element dispatch on long homogeneous lists
+_SCALAR_FORMATTERS = {
+    int: str,
+    float: str,
+    bool: lambda value: "#t" if value else "#f",
+    type(None): lambda value: "nil",
+    str: _format_string,
+}
+
+
+# Common date formats, tried in order. Each pattern accepts exactly what
+# datetime.strptime accepts for the directive, and is paired with the
+# positions of its (year, month, day) groups.
+_YEAR = r'(\d\d\d\d)'
+_MONTH = r'(1[0-2]|0[1-9]|[1-9])'
+_DAY = r'(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])'
+_DATE_FORMATS = (
+    (re.compile(f'{_YEAR}-{_MONTH}-{_DAY}'), (1, 2, 3)),  # %Y-%m-%d
+    (re.compile(f'{_YEAR}/{_MONTH}/{_DAY}'), (1, 2, 3)),  # %Y/%m/%d
+    (re.compile(f'{_DAY}/{_MONTH}/{_YEAR}'), (3, 2, 1)),  # %d/%m/%Y
+    (re.compile(f'{_MONTH}/{_DAY}/{_YEAR}'), (3, 1, 2)),  # %m/%d/%Y
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> Optional[Tuple[int, int, int]]:
+    """Parse a date string into (year, month, day), or None if unrecognised"""
+    for pattern, (year, month, day) in _DATE_FORMATS:
+        match = pattern.fullmatch(date_str)
+        if not match:
+            continue
+        parsed_date = int(match[year]), int(match[month]), int(match[day])
+        try:
+            date(*parsed_date)
+        except ValueError:
+            # Right shape but not a real calendar date
+            continue
+        return parsed_date
+    return None
+
 
 class SExpressionConverter:
     """Production-ready converter with comprehensive error handling"""
     
     def __init__(self, namespace_prefix: str = "data", pretty_print: bool = False):
         self.namespace_prefix = namespace_prefix
+        self._ns_open = f"({namespace_prefix}:"
         self.pretty_print = pretty_print
         self.indent_level = 0
         self.indent_size = 2
-    
-    def convert(self, data: Any, key: str = None) -> str:
-        """Main conversion method with type dispatch"""
-        type_handlers = {
+        self._stream = None
+        self._dispatch = {
             dict: self._convert_dict,
             list: self._convert_list,
             str: self._convert_string,
@@ -36,119 +131,158 @@ class SExpressionConverter:
             bool: self._convert_boolean,
             type(None): self._convert_null,
         }
-        
-        handler = type_handlers.get(type(data), self._convert_unknown)
-        return handler(data, key)
     
-    def _convert_dict(self, data: Dict, key: str = None) -> str:
+    def convert(self, data: Any, key: str = None) -> str:
+        """Main conversion method with type dispatch"""
+        out = []
+        self._emit(data, key, out)
+        return ''.join(out)
+    
+    def convert_to(self, data: Any, stream: TextIO, key: str = None) -> None:
+        """Write the conversion to stream without building the whole string"""
+        out = []
+        self._stream = stream
+        try:
+            self._emit(data, key, out)
+        finally:
+            self._stream = None
+        stream.write(''.join(out))
+    
+    def _flush(self, out: List[str]) -> None:
+        """Write buffered tokens to the output stream"""
+        self._stream.write(''.join(out))
+        out.clear()
+    
+    def _emit(self, data: Any, key: str, out: List[str]) -> None:
+        """Append the S-expression tokens for data to out"""
+        handler = self._dispatch.get(type(data), self._convert_unknown)
+        handler(data, key, out)
+    
+    def _convert_dict(self, data: Dict, key: str, out: List[str]) -> None:
         """Convert dictionary to S-expression"""
-        items = []
+        lead, separator, tail = self._item_layout(len(data))
+        out.append('(' + lead)
+        
+        # Bind hot lookups to locals for the loop
+        append = out.append
+        emit = self._emit
+        is_date_field = self._is_date_field
+        ns_open = self._ns_open
         
-        for k, v in data.items():
+        for i, (k, v) in enumerate(data.items()):
+            if len(out) >= _STREAM_CHUNK and self._stream is not None:
+                self._flush(out)
+            if i:
+                append(separator)
             # Special handling for dates
-            if self._is_date_field(k, v):
-                items.append(self._convert_date(v, k))
+            if is_date_field(k, v):
+                self._convert_date(v, k, out)
             # Special handling for items arrays
-            elif k == 'items' and isinstance(v, list):
-                items.append(self._convert_items_list(v, k))
+            elif k == 'items' and type(v) is list:
+                self._convert_items_list(v, k, out)
             else:
-                converted_value = self.convert(v)
-                items.append(f"({self.namespace_prefix}:{k} {converted_value})")
+                append(f"{ns_open}{k} ")
+                emit(v, None, out)
+                append(')')
         
-        content = self._join_items(items)
-        return content if key is None else content
+        out.append(tail + ')')
     
-    def _convert_list(self, data: List, key: str = None) -> str:
+    def _convert_list(self, data: List, key: str, out: List[str]) -> None:
         """Convert list to S-expression"""
-        items = [self.convert(item, 'item' if key == 'items' else None) for item in data]
-        content = ' '.join(items)
+        item_key = 'item' if key == 'items' else None
+        out.append(f"{self._ns_open}{key} " if key else "(")
         
-        if key:
-            return f"({self.namespace_prefix}:{key} {content})"
-        return f"({content})"
+        # Fast path: a long list of one scalar type is formatted in slices of
+        # _STREAM_CHUNK elements, flushing between slices when streaming
+        if len(data) > _FAST_LIST_MIN:
+            item_type = type(data[0])
+            formatter = _SCALAR_FORMATTERS.get(item_type)
+            if formatter is not None and all(type(item) is item_type for item in data):
+                for start in range(0, len(data), _STREAM_CHUNK):
+                    if start:
+                        out.append(' ')
+                    out.append(' '.join(map(formatter, data[start:start + _STREAM_CHUNK])))
+                    if self._stream is not None:
+                        self._flush(out)
+                out.append(')')
+                return
+        
+        for i, item in enumerate(data):
+            if len(out) >= _STREAM_CHUNK and self._stream is not None:
+                self._flush(out)
+            if i:
+                out.append(' ')
+            self._emit(item, item_key, out)
+        
+        out.append(')')
     
-    def _convert_items_list(self, data: List, key: str) -> str:
+    def _convert_items_list(self, data: List, key: str, out: List[str]) -> None:
         """Special handling for items list"""
-        items = [self.convert(item, 'item') for item in data]
-        return f"({self.namespace_prefix}:{key} {' '.join(items)})"
+        out.append(f"{self._ns_open}{key} ")
+        
+        for i, item in enumerate(data):
+            if len(out) >= _STREAM_CHUNK and self._stream is not None:
+                self._flush(out)
+            if i:
+                out.append(' ')
+            self._emit(item, 'item', out)
+        
+        out.append(')')
     
-    def _convert_string(self, data: str, key: str = None) -> str:
+    def _convert_string(self, data: str, key: str, out: List[str]) -> None:
         """Convert string with intelligent formatting"""
-        # Part numbers and IDs (alphanumeric starting with letter)
-        if re.match(r'^[A-Z]\d+$', data):
-            return f"'{data}"
-        
-        # Proper string escaping
-        escaped = data.replace('\\', '\\\\').replace('"', '\\"')
-        return f'"{escaped}"'
+        out.append(_format_string(data))
     
-    def _convert_number(self, data: Union[int, float], key: str = None) -> str:
+    def _convert_number(self, data: Union[int, float], key: str, out: List[str]) -> None:
         """Convert numeric values"""
-        return str(data)
+        out.append(str(data))
     
-    def _convert_boolean(self, data: bool, key: str = None) -> str:
+    def _convert_boolean(self, data: bool, key: str, out: List[str]) -> None:
         """Convert boolean to Scheme format"""
-        return "#t" if data else "#f"
+        out.append("#t" if data else "#f")
     
-    def _convert_null(self, data: None, key: str = None) -> str:
+    def _convert_null(self, data: None, key: str, out: List[str]) -> None:
         """Convert null/None to nil"""
-        return "nil"
+        out.append("nil")
     
-    def _convert_unknown(self, data: Any, key: str = None) -> str:
+    def _convert_unknown(self, data: Any, key: str, out: List[str]) -> None:
         """Fallback for unknown types"""
-        return f'"{str(data)}"'
+        out.append(f'"{str(data)}"')
     
     def _is_date_field(self, key: str, value: Any) -> bool:
         """Detect date fields"""
         if not isinstance(value, str):
             return False
         
-        date_keywords = ['date', 'timestamp', 'created', 'updated', 'time', 'when']
-        if key.lower() in date_keywords:
+        if key.lower() in _DATE_KEYWORDS:
             return True
         
-        # Pattern-based detection
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # DD/MM/YYYY or MM/DD/YYYY
-            r'\d{4}/\d{2}/\d{2}',  # YYYY/MM/DD
-        ]
+        # Every date pattern is at least 10 characters and starts with a digit
+        if len(value) < 10 or not value[0].isdigit():
+            return False
         
-        return any(re.match(pattern, value) for pattern in date_patterns)
+        # Pattern-based detection
+        return _DATE_PATTERNS_RE.match(value) is not None
     
-    def _convert_date(self, date_str: str, key: str) -> str:
+    def _convert_date(self, date_str: str, key: str, out: List[str]) -> None:
         """Convert date string to make-date call"""
-        try:
-            formats = ['%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%m/%d/%Y']
-            
-            for fmt in formats:
-                try:
-                    parsed_date = datetime.strptime(date_str, fmt)
-                    return f"({self.namespace_prefix}:{key} (make-date {parsed_date.year} {parsed_date.month:02d} {parsed_date.day:02d}))"
-                except ValueError:
-                    continue
-            
+        parsed_date = _parse_date(date_str)
+        
+        if parsed_date:
+            year, month, day = parsed_date
+            out.append(f"{self._ns_open}{key} (make-date {year} {month:02d} {day:02d}))")
+        else:
             # If parsing fails, treat as string
-            return f"({self.namespace_prefix}:{key} \"{date_str}\")"
-            
-        except Exception:
-            return f"({self.namespace_prefix}:{key} \"{date_str}\")"
+            out.append(f"{self._ns_open}{key} \"{date_str}\")")
     
-    def _join_items(self, items: List[str]) -> str:
-        """Join items with optional pretty printing"""
-        if not self.pretty_print:
-            return f"({' '.join(items)})"
-        
-        if not items:
-            return "()"
-        
-        if len(items) == 1:
-            return f"({items[0]})"
+    def _item_layout(self, count: int) -> tuple[str, str, str]:
+        """Return (lead, separator, tail) for laying out count items"""
+        if not self.pretty_print or count < 2:
+            return '', ' ', ''
         
         # Multi-line formatting
-        indent = '  ' * (self.indent_level + 1)
-        formatted_items = f"\n{indent}" + f"\n{indent}".join(items) + f"\n{'  ' * self.indent_level}"
-        return f"({formatted_items})"
+        indent = '\n' + '  ' * (self.indent_level + 1)
+        return indent, indent, '\n' + '  ' * self.indent_level
 
 
 def load_data(file_path: str) -> tuple[Any, str]:
@@ -158,25 +292,38 @@ def load_data(file_path: str) -> tuple[Any, str]:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    with open(path, 'r', encoding='utf-8') as file:
+    # Read raw bytes: both parsers detect the encoding themselves
+    with open(path, 'rb') as file:
         content = file.read()
         
         # Format detection
         if path.suffix.lower() in ['.yaml', '.yml']:
-            return yaml.safe_load(content), 'yaml'
+            return yaml.load(content, Loader=_YamlLoader), 'yaml'
         elif path.suffix.lower() == '.json':
-            return json.loads(content), 'json'
+            return _json_loads(content), 'json'
         else:
-            # Auto-detect
+            # Auto-detect: JSON documents start with { or [, so anything else
+            # goes straight to YAML and is only retried as JSON if that fails
+            looks_like_json = content.lstrip()[:1] in (b'{', b'[')
+            
+            if looks_like_json:
+                try:
+                    return _json_loads(content), 'json'
+                except json.JSONDecodeError:
+                    pass
+            
             try:
-                data = json.loads(content)
-                return data, 'json'
-            except json.JSONDecodeError:
+                return yaml.load(content, Loader=_YamlLoader), 'yaml'
+            except yaml.YAMLError:
+                pass
+            
+            if not looks_like_json:
                 try:
-                    data = yaml.safe_load(content)
-                    return data, 'yaml'
-                except yaml.YAMLError:
-                    raise ValueError("Unable to parse as JSON or YAML")
+                    return _json_loads(content), 'json'
+                except json.JSONDecodeError:
+                    pass
+            
+            raise ValueError("Unable to parse as JSON or YAML")
 
 
 def print_usage():
@@ -205,9 +352,8 @@ def main():
         # Load and convert
         data, format_type = load_data(input_file)
         converter = SExpressionConverter(namespace_prefix=format_type, pretty_print=pretty_print)
-        s_expression = converter.convert(data)
-        
-        print(s_expression)
+        converter.convert_to(data, sys.stdout)
+        sys.stdout.write('\n')
         
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
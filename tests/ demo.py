@@ -8,12 +8,30 @@ import subprocess
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT / "src"
+EXAMPLES_DIR = ROOT / "examples"
+
+sys.path.insert(0, str(SRC_DIR))
+from final_converter import SExpressionConverter, load_data  # noqa: E402
+
+# Run each conversion in a fresh interpreter instead of in-process
+ISOLATE = '--isolate' in sys.argv
+
 
 def run_converter(file_path: str, options: str = ""):
     """Run converter and return output"""
-    cmd = f'"{sys.executable}" final_converter.py "{file_path}" {options}'
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=Path(__file__).parent)
-    return result.stdout.strip(), result.stderr.strip(), result.returncode
+    if ISOLATE:
+        cmd = [sys.executable, str(SRC_DIR / "final_converter.py"), str(EXAMPLES_DIR / file_path), *options.split()]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return result.stdout.strip(), result.stderr.strip(), result.returncode
+    
+    try:
+        data, format_type = load_data(EXAMPLES_DIR / file_path)
+        converter = SExpressionConverter(namespace_prefix=format_type, pretty_print='--pretty' in options)
+        return converter.convert(data).strip(), "", 0
+    except Exception as e:
+        return "", f"Conversion error: {e}", 1
 
 
 def print_section(title: str):
@@ -121,7 +139,7 @@ Expected (from challenge):
 🔧 Key Algorithms:
    • Date pattern recognition and parsing
    • String escaping and quoting logic
-   • Part number detection (regex-based)
+   • Part number detection (capital letter + digits check)
    • Nested structure traversal
    • Format auto-detection
 
@@ -7,6 +7,33 @@ import subprocess
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT / "src"
+EXAMPLES_DIR = ROOT / "examples"
+
+sys.path.insert(0, str(SRC_DIR))
+from converter import SExpressionConverter, load_data  # noqa: E402
+
+# Run each conversion in a fresh interpreter instead of in-process
+ISOLATE = '--isolate' in sys.argv
+
+
+def convert_file(input_file: str) -> str:
+    """Convert input_file and return the S-expression output"""
+    if ISOLATE:
+        result = subprocess.run(
+            [sys.executable, str(SRC_DIR / "converter.py"), str(EXAMPLES_DIR / input_file)],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        return result.stdout.strip()
+    
+    data, format_type = load_data(EXAMPLES_DIR / input_file)
+    converter = SExpressionConverter(namespace_prefix=format_type)
+    return converter.convert(data).strip()
+
 
 def run_test(input_file: str, expected_patterns: list):
     """Run converter and check output"""
@@ -15,18 +42,7 @@ def run_test(input_file: str, expected_patterns: list):
     print(f"{'='*50}")
     
     try:
-        result = subprocess.run(
-            [sys.executable, "converter.py", input_file],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent
-        )
-        
-        if result.returncode != 0:
-            print(f"ERROR: {result.stderr}")
-            return False
-        
-        output = result.stdout.strip()
+        output = convert_file(input_file)
         print("Output:")
         print(output)
         
@@ -79,16 +95,26 @@ def main():
         "'E1628"
     ]
     
+    # Test booleans, and an ID with a trailing newline (a string, not a part number)
+    riscv_patterns = [
+        "(yaml:project",
+        "(yaml:design_complete #t)",
+        "(yaml:tape_out_approved #f)",
+        "(yaml:errata_id \"E1042\n\")"
+    ]
+    
     yaml_success = run_test("sample.yaml", yaml_patterns)
     json_success = run_test("sample.json", json_patterns)
+    riscv_success = run_test("test_riscv.yaml", riscv_patterns)
     
     print(f"\n{'='*50}")
     print("TEST RESULTS:")
     print(f"YAML Test: {'PASS' if yaml_success else 'FAIL'}")
     print(f"JSON Test: {'PASS' if json_success else 'FAIL'}")
+    print(f"RISC-V YAML Test: {'PASS' if riscv_success else 'FAIL'}")
     print(f"{'='*50}")
     
-    if yaml_success and json_success:
+    if yaml_success and json_success and riscv_success:
         print("✅ All tests passed!")
         return 0
     else: